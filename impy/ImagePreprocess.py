@@ -6,8 +6,6 @@ Description: Common pre-processing operations for images.
 """
 # Utils
 import numpy as np
-from numpy import r_
-from numpy import c_
 import cv2
 import math
 
@@ -71,15 +69,15 @@ class ImagePreprocess(object):
 				--------------------------
 		"""
 		# Local variable assertions
-		if (frameHeight == None):
+		if (frameHeight is None):
 			raise Exception("Parameter {} cannot be empty.".format("frameHeight"))
-		if (frameWidth == None):
+		if (frameWidth is None):
 			raise Exception("Parameter {} cannot be empty.".format("frameWidth"))
-		if (boundingBoxes == None):
+		if (boundingBoxes is None):
 			raise Exception("Parameter {} cannot be empty.".format("bndboxes"))
 		else:
 			localBoundingBoxes = boundingBoxes
-		if (offset == None):
+		if (offset is None):
 			raise Exception("Parameter {} cannot be empty.".format("offset"))
 		if ((type(offset) == list) or (type(offset) == tuple)):
 			if (len(offset) != 2):
@@ -98,15 +96,62 @@ class ImagePreprocess(object):
 		widthOffset = offset[0]
 		heightOffset = offset[1]
 		# Compute the boundaries of the bounding boxes.
-		x_coordinates = []
-		y_coordinates = []
-		for bndbox in localBoundingBoxes:
-			x_coordinates.append(bndbox[0])
-			x_coordinates.append(bndbox[2])
-			y_coordinates.append(bndbox[1])
-			y_coordinates.append(bndbox[3])
-		xmin, xmax = min(x_coordinates), max(x_coordinates)
-		ymin, ymax = min(y_coordinates), max(y_coordinates)
+		bndboxes = np.asarray(localBoundingBoxes, dtype = np.int32).reshape(-1, 4)
+		xmin, ymin = int(bndboxes[:, 0].min()), int(bndboxes[:, 1].min())
+		xmax, ymax = int(bndboxes[:, 2].max()), int(bndboxes[:, 3].max())
+		# Center the bounding boxes in a region of the size of the offset.
+		RoiXMin, RoiYMin, RoiXMax, RoiYMax = ImagePreprocess.adjust_roi(xmin, ymin, xmax, ymax,
+																							 frameWidth, frameHeight,
+																							 widthOffset, heightOffset)
+		# Return cropping coordinates and updated bounding boxes
+		return RoiXMin, RoiYMin, RoiXMax, RoiYMax
+
+	def cropAndAdjust(self, frame = None, boundingBoxes = None, offset = None):
+		"""
+		Crops the region of the frame computed by adjustImage so the following
+		operations only work on the region that contains the bounding boxes.
+		Args:
+			frame: A tensor that contains an image.
+			boundingBoxes: A list of lists that contains the coordinates of the
+												bounding boxes in the frame.
+			offset: A list or tuple of ints that contains the amount of space to give
+							at each side of the edge bounding boxes, (width, height).
+		Returns:
+			A tensor that contains the cropped region and a 4-sized tuple that
+			contains the cropping coordinates (RoiXMin, RoiYMin, RoiXMax, RoiYMax).
+		"""
+		# Assertions
+		if (frame is None):
+			raise ValueError("Frame cannot be empty.")
+		# Local variables
+		frameHeight, frameWidth = frame.shape[:2]
+		# Find the region of interest.
+		RoiXMin, RoiYMin, RoiXMax, RoiYMax = self.adjustImage(frameHeight = frameHeight,
+																													frameWidth = frameWidth,
+																													boundingBoxes = boundingBoxes,
+																													offset = offset)
+		# Crop the region.
+		roi = np.ascontiguousarray(frame[RoiYMin:RoiYMax, RoiXMin:RoiXMax])
+		return roi, (RoiXMin, RoiYMin, RoiXMax, RoiYMax)
+
+	@staticmethod
+	def adjust_roi(xmin = None, ymin = None, xmax = None, ymax = None, frameWidth = None, frameHeight = None, widthOffset = None, heightOffset = None):
+		"""
+		Given the boundaries that enclose the bounding boxes, find a region of
+		interest of the size of the offset that keeps the bounding boxes centered
+		and stays inside the frame.
+		Args:
+			xmin: An int that contains the smallest x coordinate of the bounding boxes.
+			ymin: An int that contains the smallest y coordinate of the bounding boxes.
+			xmax: An int that contains the biggest x coordinate of the bounding boxes.
+			ymax: An int that contains the biggest y coordinate of the bounding boxes.
+			frameWidth: An int that represents the width of the frame.
+			frameHeight: An int that represents the height of the frame.
+			widthOffset: An int that contains the desired width of the region.
+			heightOffset: An int that contains the desired height of the region.
+		Returns:
+			A 4-sized tuple that contains the coordinates to crop the original frame.
+		"""
 		RoiX, RoiY = (xmax - xmin), (ymax - ymin)
 		if (RoiY >= heightOffset):
 			offsetY = 10
@@ -122,115 +167,23 @@ class ImagePreprocess(object):
 		# print("Offsets (X, Y): ", offsetX, offsetY)
 		# Determine space on x.
 		# Put bounding boxes in the center.
-		offsetXLeft = offsetX // 2
-		offsetXRight = offsetX - offsetXLeft
+		half, rem = divmod(offsetX, 2)
+		offsetXLeft, offsetXRight = half, half + rem
 		# Put bounding boxes in the top left corner.
 		# offsetXLeft = offsetX - 5
 		# offsetXRight = offsetX - offsetXLeft
 		# Determine space on y.
-		offsetYTop = offsetY - offsetY //2
-		offsetYBottom = offsetY - offsetYTop
+		half, rem = divmod(offsetY, 2)
+		offsetYBottom, offsetYTop = half, half + rem
 		# Add space on X.
-		# If there is not enough space on the left.
-		if ((xmin - offsetXLeft) < 0):
-			# Crop at origin. 
-			RoiXMin = 0
-			# Space that can be used in the top.
-			availableSpaceLeft = xmin
-			# Subtract the available space from offsetXRight to maintain our size.
-			offsetXLeft = offsetXLeft - availableSpaceLeft
-			# Determine if there is space on the right to compensate.
-			if ((xmax + offsetXLeft + offsetXRight) < frameWidth):
-				RoiXMax = xmax + offsetXLeft + offsetXRight
-			elif ((xmax + offsetXLeft + offsetXRight) == frameWidth):
-				RoiXMax = frameWidth
-			# There is not enough space to compensate on the right.
-			else:
-				# If there is space on the right.
-				if ((xmax + offsetXRight) < frameWidth):
-					RoiXMax = xmax + offsetXRight
-				elif ((xmax + offsetXRight) == frameWidth):
-					RoiXMax = frameWidth
-				# If there is not space, then the x offset might have been set to 10.
-				# But the image is still too small. So crop at width.
-				else:
-					RoiXMax = frameWidth
-					# raise ValueError("xmax({}) + offsetXRight({}) is inconsistent."\
-					# 								.format(xmax, offsetXRight))
-		# If there is space on the left.
-		else:
-			# Compute RoiXMin.
-			RoiXMin = xmin - offsetXLeft
-			# Check if there is space on the right.
-			if ((xmax + offsetXRight) < frameWidth):
-				RoiXMax = xmax + offsetXRight
-			elif ((xmax + offsetXRight) == frameWidth):
-				RoiXMax = frameWidth
-			# If there is not space on the right.
-			else:
-				RoiXMax = frameWidth
-				# Space that can be used on the right.
-				availableSpaceRight = frameWidth - xmax
-				# Subtract the available space from offsetXRight to maintain our size.
-				offsetXRight = offsetXRight - availableSpaceRight
-				# Check if we can compensate on the left.
-				if ((xmin - offsetXLeft - offsetXRight) > 0):
-					RoiXMin = xmin - offsetXLeft - offsetXRight
-				elif ((xmin - offsetXLeft - offsetXRight) == 0):
-					RoiXMin = 0
-				# If we cannot compensate then leave it.
-				else:
-					pass
+		# Center the bounding boxes, then slide the region back inside the frame
+		# if it goes over the right edge and crop it at the origin if the frame
+		# is still too small.
+		RoiXMin = max(0, min(xmin - offsetXLeft, frameWidth - (offsetXLeft + RoiX + offsetXRight)))
+		RoiXMax = min(frameWidth, RoiXMin + offsetXLeft + RoiX + offsetXRight)
 		# Add space on y.
-		# If there is enough not enough space in the top.
-		if ((ymin - offsetYTop) < 0):
-			# Crop at origin.
-			RoiYMin = 0
-			# Space that can be used in the top.
-			availableSpaceTop = ymin
-			# Subtract the available space from offsetYTop to maintain our size.
-			offsetYTop = offsetYTop - availableSpaceTop
-			# Determine if there is space in the bottom to compensate.
-			if ((ymax + offsetYTop + offsetYBottom) < frameHeight):
-				RoiYMax = ymax + offsetYTop + offsetYBottom
-			elif ((ymax + offsetYTop + offsetYBottom) == frameHeight):
-				RoiYMax = frameHeight
-			# There is not enough space in the bottom to compensate.
-			else:
-				# If there is space in the bottom.
-				if ((ymax + offsetYBottom) < frameHeight):
-					RoiYMax = ymax + offsetYBottom
-				elif ((ymax + offsetYBottom) == frameHeight):
-					RoiYMax = frameHeight
-				# If there is not space, then the y offset might have been set to 10.
-				# But the image is still too small. So crop at height.
-				else:
-					RoiYMax = frameHeight
-					# raise ValueError("ymax({}) + offsetYBottom({}) is inconsistent"\
-					# 									.format(ymax, RoiYMax))
-		# If there is space in the top.
-		else:
-			RoiYMin = ymin - offsetYTop
-			# Check space in the bottom.
-			if ((ymax + offsetYBottom) < frameHeight):
-				RoiYMax = ymax + offsetYTop
-			elif ((ymax + offsetYBottom) == frameHeight):
-				RoiYMax = frameHeight
-			# There is not enough space in the bottom.
-			else:
-				RoiYMax = frameHeight
-				# Space that can be used on the bottom.
-				availableSpaceBottom = frameHeight - ymax
-				# Subtract the available space from offsetYBottom to maintain our size.
-				offsetYBottom = offsetYBottom - availableSpaceBottom
-				# Check if we can compensate in the top.
-				if ((ymin - offsetYTop - offsetYBottom) > 0):
-					RoiYMin = ymin - offsetYTop - offsetYBottom
-				elif ((ymin - offsetYTop - offsetYBottom) == 0):
-					RoiYMin = 0
-				# If there is not enough space, then leave it.
-				else:
-					pass
+		RoiYMin = max(0, min(ymin - offsetYTop, frameHeight - (offsetYTop + RoiY + offsetYBottom)))
+		RoiYMax = min(frameHeight, RoiYMin + offsetYTop + RoiY + offsetYBottom)
 		# print("Output Rois: ", RoiXMin, RoiYMin, RoiXMax, RoiYMax)
 		# print("Size (X,Y):", (RoiXMax-RoiXMin), (RoiYMax-RoiYMin), "\n")
 		# Assertions.
@@ -240,7 +193,7 @@ class ImagePreprocess(object):
 		# if ((RoiYMax-RoiYMin) < offset-100):
 		# 	raise ValueError("Cropping frame {} is much smaller than offset {} in y."\
 		# 										.format((RoiYMax-RoiYMin), offset-100))
-		# Return cropping coordinates and updated bounding boxes
+		# Return cropping coordinates
 		return RoiXMin, RoiYMin, RoiXMax, RoiYMax
 
 	def includeBoundingBoxes(self, edges = None, boundingBoxes = None, names = None):
@@ -255,40 +208,30 @@ class ImagePreprocess(object):
 			of strings that contains the labels of the bounding boxes.
 		"""
 		# Assertions
-		if (edges == None):
+		if (edges is None):
 			raise ValueError("Edges cannot be emtpy.")
-		if (boundingBoxes == None):
+		if (boundingBoxes is None):
 			raise ValueError("Bounding boxes cannot be empty.")
-		if (names == None):
+		if (names is None):
 			raise ValueError("Names cannot be empty.")
 		# Local variables
 		ix, iy, x, y = edges
-		# print(ix, iy, x, y)
+		shift = np.array([ix, iy, ix, iy], dtype = np.int32)
+		bndboxes = np.asarray(boundingBoxes, dtype = np.int32).reshape(-1, 4)
 		# Logic
-		newBoundingBoxes = []
-		newNames = []
-		for i in range(len(boundingBoxes)):
-			bix, biy, bx, by = boundingBoxes[i]
-			name = names[i]
-			# If the x and y axis are contained in edges.
-			if (((bix >= ix) and (bx <= x)) and 
-					((biy >= iy) and (by <= y))):
-				# print(bix, biy, bx, by)
-				bix = bix - ix
-				bx = bx - ix
-				biy = biy - iy
-				by = by - iy
-				# Make sure the bounding boxes are not negative or
-				# are not the edges of the frame.
-				if ((bix < 0) or (biy < 0)):
-					raise Exception("ERROR: One of the bounding boxes is negative. Report this problem.")
-				if (bx == (x - ix)):
-					bx -= 1
-				if (by == (y - iy)):
-					by -= 1
-				# Save new bounding boxes.
-				newBoundingBoxes.append([bix, biy, bx, by])
-				newNames.append(name)
+		# If the x and y axis are contained in edges.
+		mask = (bndboxes[:, 0] >= ix) & (bndboxes[:, 2] <= x) &\
+						(bndboxes[:, 1] >= iy) & (bndboxes[:, 3] <= y)
+		newBoundingBoxes = bndboxes[mask]
+		newBoundingBoxes -= shift
+		# Make sure the bounding boxes are not negative or
+		# are not the edges of the frame.
+		if ((newBoundingBoxes[:, :2] < 0).any()):
+			raise Exception("ERROR: One of the bounding boxes is negative. Report this problem.")
+		newBoundingBoxes[newBoundingBoxes[:, 2] == (x - ix), 2] -= 1
+		newBoundingBoxes[newBoundingBoxes[:, 3] == (y - iy), 3] -= 1
+		newNames = [names[i] for i in np.nonzero(mask)[0]]
+		newBoundingBoxes = newBoundingBoxes.tolist()
 		return newBoundingBoxes, newNames
 
 	def divideIntoPatches(self, imageWidth = None, imageHeight = None, slideWindowSize = None, strideSize = None, padding = None, numberPatches = None):
@@ -307,22 +250,22 @@ class ImagePreprocess(object):
 			numberPatches: A tuple (numberWidth, numberHeight) that 
 												contains the number of patches in each axis.
 		Return: 
-			A tuple containing the number of patches that fill the
+			A tensor of shape (N, 4) and type int32 containing the patches that fill the
 			given parameters with the format(ix, iy, x, y), an int containing the number of row patches,
 			an int containing the number of column patches
 		"""
 		# Assertions
-		if (imageWidth == None):
+		if (imageWidth is None):
 			raise Exception("Image width cannot be empty.")
-		if (imageHeight == None):
+		if (imageHeight is None):
 			raise Exception("Image height cannot be empty.")
-		if (slideWindowSize == None):
+		if (slideWindowSize is None):
 			slideWindowSize = (0, 0)
-		if (strideSize == None):
+		if (strideSize is None):
 			strideSize = (0, 0)
-		if padding == None:
+		if padding is None:
 			padding = "VALID"
-		if (numberPatches == None):
+		if (numberPatches is None):
 			numberPatches = (1, 1)
 		# Get sliding window sizes
 		slideWindowWidth, slideWindowHeight = slideWindowSize[0], slideWindowSize[1]
@@ -345,11 +288,6 @@ class ImagePreprocess(object):
 			strideWidth = imageWidth - 1
 		# Start padding operation
 		if padding == "VALID":
-			startPixelsHeight = 0
-			endPixelsHeight = slideWindowHeight
-			startPixelsWidth = 0
-			endPixelsWidth = slideWindowWidth
-			patchesCoordinates = []
 			numberPatchesHeight, numberPatchesWidth = ImagePreprocess.get_valid_padding(slideWindowHeight,
 																								 strideHeight,
 																								 imageHeight,
@@ -357,30 +295,16 @@ class ImagePreprocess(object):
 																								 strideWidth,
 																								 imageWidth)
 			# print("numberPatchesHeight: ", numberPatchesHeight, "numberPatchesWidth: ", numberPatchesWidth)
-			for i in range(numberPatchesHeight):
-				for j in range(numberPatchesWidth):
-					patchesCoordinates.append([startPixelsWidth,\
-													startPixelsHeight,\
-													endPixelsWidth,\
-													endPixelsHeight])
-					# Update width with strides
-					startPixelsWidth += strideWidth
-					endPixelsWidth += strideWidth
-				# Re-initialize the width parameters 
-				startPixelsWidth = 0
-				endPixelsWidth = slideWindowWidth
-				# Update height with height stride size
-				startPixelsHeight += strideHeight
-				endPixelsHeight += strideHeight
+			patchesCoordinates = ImagePreprocess.get_patches_coordinates(slideWindowHeight,
+																	strideHeight,
+																	numberPatchesHeight,
+																	slideWindowWidth,
+																	strideWidth,
+																	numberPatchesWidth)
 			return patchesCoordinates,\
 					numberPatchesHeight,\
 					numberPatchesWidth
 		elif padding == "SAME":
-			startPixelsHeight = 0
-			endPixelsHeight = slideWindowHeight
-			startPixelsWidth = 0
-			endPixelsWidth = slideWindowWidth
-			patchesCoordinates = []
 			# Modify image tensor
 			zeros_h, zeros_w = ImagePreprocess.get_same_padding(slideWindowHeight,
 																				 strideHeight,
@@ -397,21 +321,12 @@ class ImagePreprocess(object):
 																		 slideWindowWidth,
 																		 strideWidth,
 																		 imageWidth)
-			for i in range(numberPatchesHeight):
-				for j in range(numberPatchesWidth):
-					patchesCoordinates.append([startPixelsWidth,\
-													startPixelsHeight,\
-													endPixelsWidth,\
-													endPixelsHeight])
-					# Update width with strides
-					startPixelsWidth += strideWidth
-					endPixelsWidth += strideWidth
-				# Re-initialize the width parameters 
-				startPixelsWidth = 0
-				endPixelsWidth = slideWindowWidth
-				# Update height with height stride size
-				startPixelsHeight += strideHeight
-				endPixelsHeight += strideHeight
+			patchesCoordinates = ImagePreprocess.get_patches_coordinates(slideWindowHeight,
+																	strideHeight,
+																	numberPatchesHeight,
+																	slideWindowWidth,
+																	strideWidth,
+																	numberPatchesWidth)
 			return patchesCoordinates,\
 					numberPatchesHeight,\
 					numberPatchesWidth,\
@@ -428,40 +343,52 @@ class ImagePreprocess(object):
 			strideWidth = math.floor(imageWidth / patchesCols)
 			slideWindowWidth = strideWidth
 			#print("Size: ", strideHeigth, slideWindowHeight, strideWidth, slideWindowWidth)
-			# Get valid padding
-			startPixelsHeight = 0
-			endPixelsHeight = slideWindowHeight
-			startPixelsWidth = 0
-			endPixelsWidth = slideWindowWidth
-			patchesCoordinates = []
-			numberPatchesHeight, numberPatchesWidth = ImagePreprocess.get_valid_padding(slideWindowHeight,
-																		 strideHeight,
-																		 imageHeight,
-																		 slideWindowWidth,
-																		 strideWidth,
-																		 imageWidth)
+			# The windows tile the image, so the number of patches is the requested one
+			numberPatchesHeight, numberPatchesWidth = patchesRows, patchesCols
 			#print("numberPatchesHeight: ", numberPatchesHeight, "numberPatchesWidth: ", numberPatchesWidth)
-			for i in range(numberPatchesHeight):
-				for j in range(numberPatchesWidth):
-					patchesCoordinates.append([startPixelsWidth,\
-													startPixelsHeight,\
-													endPixelsWidth,\
-													endPixelsHeight])
-					# Update width with strides
-					startPixelsWidth += strideWidth
-					endPixelsWidth += strideWidth
-				# Re-initialize the width parameters
-				startPixelsWidth = 0
-				endPixelsWidth = strideWidth
-				# Update height with height stride size
-				startPixelsHeight += strideHeight
-				endPixelsHeight += strideHeight
+			patchesCoordinates = ImagePreprocess.get_patches_coordinates(slideWindowHeight,
+																	strideHeight,
+																	numberPatchesHeight,
+																	slideWindowWidth,
+																	strideWidth,
+																	numberPatchesWidth)
 			return patchesCoordinates,\
 					numberPatchesHeight,\
 					numberPatchesWidth
 		else:
 			raise Exception("Type of padding not understood.")
 
+	@staticmethod
+	def get_patches_coordinates(slide_window_height = None, stride_height = None, number_patches_height = None, slide_window_width = None, stride_width = None, number_patches_width = None):
+		"""
+		Given the size of the sliding window, its strides and the number of
+		patches in each dimension. Compute the coordinates of every patch in
+		row-major order.
+		Args:
+			slide_window_height: int that represents the height of the slide
+									window.
+			stride_height: int that represents the height of the stride.
+			number_patches_height: int that represents the number of patches
+									in the height dimension.
+			slide_window_width: int that represents the width of the slide
+									window.
+			stride_width: int that represents the width of the stride.
+			number_patches_width: int that represents the number of patches
+									in the width dimension.
+		Returns:
+			A tensor of shape (N, 4) and type int32 that contains the coordinates
+			of the patches with the format [ix, iy, x, y].
+		"""
+		startPixelsWidth, startPixelsHeight = np.meshgrid(np.arange(number_patches_width, dtype = np.int32) * stride_width,
+																											np.arange(number_patches_height, dtype = np.int32) * stride_height)
+		startPixelsWidth = startPixelsWidth.ravel()
+		startPixelsHeight = startPixelsHeight.ravel()
+		patchesCoordinates = np.stack([startPixelsWidth,
+																	startPixelsHeight,
+																	startPixelsWidth + slide_window_width,
+																	startPixelsHeight + slide_window_height], axis = 1)
+		return patchesCoordinates.astype(np.int32, copy = False)
+
 	@staticmethod
 	def get_valid_padding(slide_window_height = None, stride_height = None, image_height = None, slide_window_width = None, stride_width = None, image_width = None):
 		"""
@@ -481,24 +408,9 @@ class ImagePreprocess(object):
 			A tuple containing the number of patches in the height and 
 				and the width dimension.
 		"""
-		number_patches_height = 0
-		number_patches_width = 0
-		while(True):
-			if slide_window_height <= image_height:
-				slide_window_height += stride_height
-				number_patches_height += 1
-			elif slide_window_height > image_height:
-				break
-			else:
-				continue
-		while(True):
-			if slide_window_width <= image_width:
-				slide_window_width += stride_width
-				number_patches_width += 1	
-			elif slide_window_width > image_width:
-				break
-			else:
-				continue
+		# Count the positions where the window still fits inside the image.
+		number_patches_height = max(0, (image_height - slide_window_height) // stride_height + 1)
+		number_patches_width = max(0, (image_width - slide_window_width) // stride_width + 1)
 		return (number_patches_height, number_patches_width)
 
 	@staticmethod
@@ -520,29 +432,12 @@ class ImagePreprocess(object):
 					to add in the height dimension and the amount of zeros
 					to add in the width dimension. 
 		"""
-		# Initialize auxiliar variables
-		number_patches_height = 0
-		number_patches_width = 0
 		# Calculate the number of patches that fit
-		while(True):
-			if slide_window_height <= image_height:
-				slide_window_height += stride_height
-				number_patches_height += 1
-			elif slide_window_height > image_height:
-				break
-			else:
-				continue
-		while(True):
-			if slide_window_width <= image_width:
-				slide_window_width += stride_width
-				number_patches_width += 1	
-			elif slide_window_width > image_width:
-				break
-			else:
-				continue
-		# Fix the excess in slide_window
-		slide_window_height -= stride_height
-		slide_window_width -= stride_width
+		number_patches_height = max(0, (image_height - slide_window_height) // stride_height + 1)
+		number_patches_width = max(0, (image_width - slide_window_width) // stride_width + 1)
+		# Move the slide window to the last position that fits
+		slide_window_height += (number_patches_height - 1) * stride_height
+		slide_window_width += (number_patches_width - 1) * stride_width
 		#print(number_patches_height, number_patches_width)
 		#print(slide_window_height, slide_window_width)
 		# Calculate how many pixels to add
@@ -582,43 +477,16 @@ class ImagePreprocess(object):
 		: return: a new opencv image with the added zeros
 		"""
 		if padding_type == "BOTH_SIDES":
-			rows, cols, d = frame.shape
-			# If height is even or odd
-			if (zeros_h % 2 == 0):
-				zeros_h = int(zeros_h/2)
-				frame = r_[np.zeros((zeros_h, cols, 3)), frame,\
-							np.zeros((zeros_h, cols, 3))]
-			else:
-				zeros_h += 1
-				zeros_h = int(zeros_h/2)
-				frame = r_[np.zeros((zeros_h, cols, 3)), frame,\
-							np.zeros((zeros_h, cols, 3))]
-
-			rows, cols, d = frame.shape
-			# If width is even or odd 
-			if (zeros_w % 2 == 0):
-				zeros_w = int(zeros_w/2)
-				# Container 
-				container = np.zeros((rows,(zeros_w*2+cols),3), np.uint8)
-				container[:,zeros_w:container.shape[1]-zeros_w:,:] = frame
-				frame = container #c_[np.zeros((rows, zeros_w)), frame, np.zeros((rows, zeros_w))]
-			else:
-				zeros_w += 1
-				zeros_w = int(zeros_w/2)
-				container = np.zeros((rows, (zeros_w*2+cols), 3), np.uint8)
-				container[:, zeros_w:container.shape[1]-zeros_w:, :] = frame
-				frame = container #c_[np.zeros((rows, zeros_w, 3)), frame, np.zeros((rows, zeros_w, 3))]
-			return frame
+			# If height or width are odd, then add one more zero to each side.
+			top = bottom = (zeros_h + 1) // 2
+			left = right = (zeros_w + 1) // 2
 		elif padding_type == "ONE_SIDE":
-			rows, cols, d = frame.shape
-			# Pad height dimension
-			frame = r_[frame, np.zeros((zeros_h, cols, 3))]
-			# Pad width dimension
-			rows, cols, d = frame.shape
-			container = np.zeros((rows, cols + zeros_w, 3), np.uint8)
-			container[:, :cols, :] = frame
-			container[:, cols:, :] = np.zeros((rows, zeros_w, 3), np.uint8)
-			return container
+			top, bottom = 0, zeros_h
+			left, right = 0, zeros_w
+		else:
+			raise Exception("Type of padding not understood.")
+		return cv2.copyMakeBorder(frame, top, bottom, left, right,\
+															cv2.BORDER_CONSTANT, value = (0, 0, 0))
 
 def drawGrid(frame = None, patches = None, patchesLabels = None):
 	"""
@@ -629,26 +497,42 @@ def drawGrid(frame = None, patches = None, patchesLabels = None):
 	: return: opencv image named frame that contains the same input
 				image but with a grid of patches draw on top.
 	"""
+	# Colors
+	red = (0, 0, 255)
+	green = (0, 255, 0)
+	# Half of the thickness of the grid lines.
+	halfThickness = 6
+	patches = np.asarray(patches, dtype = np.int32).reshape(-1, 4)
+	if (len(patchesLabels) < len(patches)):
+		raise ValueError("There has to be one label for each patch.")
+	if (len(patches) == 0):
+		return frame
 	# Iterate through patches
-	for i in range(len(patches)):
-		# Get patch
-		patch = patches[i]
+	for patch, label in zip(patches, patchesLabels):
 		# "Decode" patch
-		startHeight, startWidth, endHeight, endWidth = patch[0], patch[1],\
-														patch[2], patch[3]
-		# Draw grids
-		cv2.rectangle(frame, (startWidth, startHeight),\
-						(endWidth, endHeight), (0, 0, 255), 12)
-		roi = np.zeros([patch[2]-patch[0], patch[3]-patch[1], 3],\
-						np.uint8)
+		startHeight, startWidth, endHeight, endWidth = map(int, patch)
+		roi = frame[startHeight:endHeight, startWidth:endWidth, :]
 		# Paint the patch
-		if patchesLabels[i] == 1:
-			roi[:,:,:] = (0,0,255)
-		else:
-			roi[:,:,:] = (0,255,0)
-		cv2.addWeighted(frame[patch[0]:patch[2],patch[1]:patch[3],:],\
-						0.8, roi, 0.2, 0, roi)
-		frame[patch[0]:patch[2],patch[1]:patch[3],:] = roi
+		color = red if label == 1 else green
+		# Blend 0.8 * roi + 0.2 * color in place.
+		cv2.multiply(roi, (0.8, 0.8, 0.8, 0), dst = roi)
+		cv2.add(roi, tuple(0.2 * channel for channel in color) + (0,), dst = roi)
+	# Draw grids
+	# Neighbour patches share their edges, so merge the edges that lie on the
+	# same line and touch each other and draw each resulting segment once.
+	# Vertical edges are drawn as rows of the transposed frame.
+	horizontalEdges = np.concatenate([patches[:, [0, 1, 3]], patches[:, [2, 1, 3]]])
+	verticalEdges = np.concatenate([patches[:, [1, 0, 2]], patches[:, [3, 0, 2]]])
+	for view, edges in ((frame, horizontalEdges), (frame.transpose(1, 0, 2), verticalEdges)):
+		edges = edges[np.lexsort((edges[:, 1], edges[:, 0]))].tolist()
+		line, start, end = edges[0]
+		for nextLine, nextStart, nextEnd in edges[1:] + [[None, None, None]]:
+			if ((nextLine == line) and (nextStart <= end)):
+				end = max(end, nextEnd)
+				continue
+			view[max(0, line - halfThickness):line + halfThickness + 1,\
+					max(0, start - halfThickness):end + halfThickness + 1, :] = red
+			line, start, end = nextLine, nextStart, nextEnd
 	return frame
 
 def drawBoxes(frame = None, patchesCoordinates = None, patchesLabels = None):
@@ -659,10 +543,12 @@ def drawBoxes(frame = None, patchesCoordinates = None, patchesLabels = None):
 							  of coordinates
 	:param patchesLabels: a list containing the labels of the coordinates
 	"""
+	# Colors
+	blue = (255, 0, 0)
 	for coord in patchesCoordinates:
 		# Decode coordinate [iy, ix, y, x]
-		iy, ix, y, x = coord[0], coord[1], coord[2], coord[3]
+		iy, ix, y, x = map(int, coord)
 		# Draw box
-		cv2.rectangle(frame, (ix, iy), (x, y), (255, 0, 0), 8)
+		cv2.rectangle(frame, (ix, iy), (x, y), blue, 8)
 	return frame
 
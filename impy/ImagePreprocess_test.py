@@ -25,6 +25,13 @@ class ImageProcess_test(unittest.TestCase):
 														padding = "VALID_FIT_ALL",
 														numberPatches = (3,3))
 		self.assertEqual(len(patches), (number_patches[0] * number_patches[1]))
+		# The image does not divide evenly into the number of patches
+		patches, h, w = self.prep.divideIntoPatches(imageWidth = 10,
+														imageHeight = 10,
+														padding = "VALID_FIT_ALL",
+														numberPatches = (4, 4))
+		self.assertEqual((h, w), (4, 4))
+		self.assertEqual(patches.tolist()[-1], [6, 6, 8, 8])
 
 	def test_divideIntoPatchesVALID(self):
 		# Simulate image
@@ -37,6 +44,8 @@ class ImageProcess_test(unittest.TestCase):
 														strideSize = (100, 100),
 														padding = "VALID")
 		self.assertEqual(len(patches), (24))
+		self.assertEqual(patches.shape, (24, 4))
+		self.assertEqual(patches.dtype, np.int32)
 
 	def test_divideIntoPatchesSAME(self):
 		# Simulate image
@@ -50,6 +59,58 @@ class ImageProcess_test(unittest.TestCase):
 														padding = "SAME")
 		self.assertEqual(len(patches), (35))
 
+	def test_lazySAMEpad(self):
+		# Simulate image
+		frame = np.ones((480, 640, 3), np.uint8)
+		# Odd amounts of zeros are rounded up on each side
+		padded = ImagePreprocess.lazySAMEpad(frame = frame, zeros_h = 5, zeros_w = 4,
+																					padding_type = "BOTH_SIDES")
+		self.assertEqual(padded.shape, (486, 644, 3))
+		self.assertEqual(padded.dtype, np.uint8)
+		self.assertEqual(padded[:3, :, :].sum() + padded[:, :2, :].sum(), 0)
+		padded = ImagePreprocess.lazySAMEpad(frame = frame, zeros_h = 5, zeros_w = 4,
+																					padding_type = "ONE_SIDE")
+		self.assertEqual(padded.shape, (485, 644, 3))
+		self.assertEqual(padded.dtype, np.uint8)
+		self.assertEqual(padded[:480, :640, :].sum(), 480 * 640 * 3)
+
+	def test_drawGrid(self):
+		# Simulate image
+		frame = np.full((600, 600, 3), 50, np.uint8)
+		# Patches [iy, ix, y, x] that only touch at a corner
+		frame = drawGrid(frame = frame,
+											patches = [[0, 0, 100, 100], [100, 100, 200, 200]],
+											patchesLabels = [0, 1])
+		# Edges are drawn over the patches only
+		self.assertEqual(frame[100, 40].tolist(), [0, 0, 255])
+		self.assertEqual(frame[200, 150].tolist(), [0, 0, 255])
+		self.assertEqual(frame[200, 40].tolist(), [50, 50, 50])
+		self.assertEqual(frame[40, 200].tolist(), [50, 50, 50])
+		# There has to be a label for every patch
+		with self.assertRaises(ValueError):
+			drawGrid(frame = frame, patches = [[0, 0, 100, 100]], patchesLabels = [])
+
+	def test_get_valid_padding(self):
+		# Window fits exactly, with a remainder and not at all
+		self.assertEqual(ImagePreprocess.get_valid_padding(100, 100, 480, 100, 100, 640), (4, 6))
+		self.assertEqual(ImagePreprocess.get_valid_padding(100, 50, 300, 100, 50, 325), (5, 5))
+		self.assertEqual(ImagePreprocess.get_valid_padding(500, 100, 480, 700, 100, 640), (0, 0))
+
+	def test_includeBoundingBoxes(self):
+		# Only the first two bounding boxes fit in the edges
+		bndboxes, names = self.prep.includeBoundingBoxes(edges = [10, 10, 110, 110],
+																										boundingBoxes = [[20, 20, 50, 50],
+																																		[60, 30, 110, 110],
+																																		[5, 20, 40, 40]],
+																										names = ["car", "person", "dog"])
+		self.assertEqual(bndboxes, [[10, 10, 40, 40], [50, 20, 99, 99]])
+		self.assertEqual(names, ["car", "person"])
+		# Bounding boxes can also be given as an array
+		bndboxes, names = self.prep.includeBoundingBoxes(edges = np.array([10, 10, 110, 110]),
+																										boundingBoxes = np.array([[20, 20, 50, 50]]),
+																										names = ["car"])
+		self.assertEqual(bndboxes, [[10, 10, 40, 40]])
+
 	def test_adjustImage(self):
 		# Local variables
 		frameHeight = 3096
@@ -79,5 +140,36 @@ class ImageProcess_test(unittest.TestCase):
 		#   self.assertLessEqual(bdx[2], frameWidth, "Xmax is negative")
 		#   self.assertLessEqual(bdx[3], frameHeight, "Ymax is negative")
 
+	def test_cropAndAdjust(self):
+		# Simulate image
+		frame = np.zeros((480, 640, 3), np.uint8)
+		roi, coordinates = self.prep.cropAndAdjust(frame = frame,
+																								boundingBoxes = [[300, 200, 340, 260]],
+																								offset = [200, 100])
+		RoiXMin, RoiYMin, RoiXMax, RoiYMax = coordinates
+		self.assertEqual(roi.shape, (RoiYMax-RoiYMin, RoiXMax-RoiXMin, 3))
+		self.assertTrue(roi.flags["C_CONTIGUOUS"])
+
+	def test_adjustImageGrid(self):
+		# Local variables
+		frameHeight = 300
+		frameWidth = 400
+		offset = [151, 121]
+		# Move a bounding box over the whole frame, including the edges
+		for ix in range(0, frameWidth - 20, 15):
+			for iy in range(0, frameHeight - 20, 15):
+				bndbox = [ix, iy, ix + 20, iy + 20]
+				RoiXMin, RoiYMin, RoiXMax,\
+				RoiYMax = self.prep.adjustImage(frameHeight = frameHeight,
+																							frameWidth = frameWidth,
+																							boundingBoxes = [bndbox],
+																							offset = offset)
+				# The region stays inside the frame and contains the bounding box
+				self.assertTrue(0 <= RoiXMin <= bndbox[0] and bndbox[2] <= RoiXMax <= frameWidth)
+				self.assertTrue(0 <= RoiYMin <= bndbox[1] and bndbox[3] <= RoiYMax <= frameHeight)
+				# The region keeps the size of the offset
+				self.assertEqual((RoiXMax-RoiXMin), offset[0])
+				self.assertEqual((RoiYMax-RoiYMin), offset[1])
+
 if __name__ == "__main__":
 	unittest.main()